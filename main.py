@@ -20,14 +20,13 @@ from functools import lru_cache
 ANSI_RGB_RE = re.compile(r'\x1B\[38;2;(\d+);(\d+);(\d+)m')
 ANSI_ANY_RE = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
 
-import requests
 import urllib3
 from colr import color as colr
 from InquirerPy import inquirer
 
 try:
     from PySide6.QtCore import (Qt, QUrl, Signal, QThread, QTimer,
-                                QSettings, QObject, QDateTime)
+                                QSettings, QObject, QDateTime, QEvent)
     from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget,
                                   QVBoxLayout, QHBoxLayout, QStackedWidget,
                                   QPushButton, QTextEdit, QLabel, QTabWidget,
@@ -39,7 +38,7 @@ try:
     from PySide6.QtWebEngineWidgets import QWebEngineView
     from PySide6.QtWebEngineCore import QWebEngineSettings, QWebEnginePage, QWebEngineProfile
     from PySide6.QtWebChannel import QWebChannel
-    from PySide6.QtGui import QFont, QIcon, QTextCursor, QPalette, QColor, QKeySequence, QAction
+    from PySide6.QtGui import QFont, QIcon, QTextCursor, QPalette, QColor, QKeySequence, QAction, QActionGroup
     USING_PYSIDE6 = True
 except ImportError as e:
     print("Please install PySide6-Essentials:")
@@ -78,6 +77,7 @@ from src.states.menu import Menu
 from src.states.pregame import Pregame
 from src.stats import Stats
 from src.table import Table
+from src import valapi_cache
 from src.websocket import Ws
 from src.os import get_os
 from src.account_manager.account_manager import AccountManager
@@ -86,6 +86,40 @@ from src.account_manager.account_auth import AccountAuth
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+VTL_LOOKUP_RE = re.compile(r'^(?P<puuid>[0-9a-fA-F-]{36})$|^(?P<user>[^#]+)#(?P<tag>.+)$')
+
+
+@lru_cache(maxsize=512)
+def strip_ansi(text):
+    """Remove ANSI escapes; memoized since ranks/agents repeat across rows and refreshes."""
+    return ANSI_ANY_RE.sub("", text)
+
+
+def safe_int(value, default=None):
+    """int() for table values that returns default instead of raising;
+    stats usually arrive as ints already and are returned as-is."""
+    if type(value) is int:
+        return value
+    if isinstance(value, (float, str)):
+        try:
+            return int(value)
+        except (ValueError, OverflowError):
+            # "--5", "²", nan/inf
+            pass
+    return default
+
+
+def safe_float(value, default=None):
+    """float() counterpart of safe_int; only strings fall back to parsing."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return default
+
 
 class LRUCache:
     """Simple LRU cache for API responses"""
@@ -227,7 +261,12 @@ class VRYWorkerThread(QThread):
                          self.colors, hide_names, self.Server, self.rpc)
 
             # Cache static API data
-            self.valoApiSkins = requests.get("https://valorant-api.com/v1/weapons/skins", timeout=10)
+            # Skin names are optional; an API outage on first run must not stop initialization
+            try:
+                self.valoApiSkins = valapi_cache.get_catalog("weapons/skins")
+            except Exception as e:
+                self.log(f"API fetch error (weapons/skins): {e}")
+                self.valoApiSkins = []
             self.gameContent = self.content.get_content()
             self.seasonID = self.content.get_latest_season_id(self.gameContent)
             self.previousSeasonID = self.content.get_previous_season_id(self.gameContent)
@@ -867,6 +906,8 @@ class VRYTableWidget(QTableWidget):
         # Track whether the enemy-team separator has been inserted for the
         # current streaming batch so we only insert it once.
         self._separator_added = False
+        # Last applied hidden state per column, so unchanged columns are skipped
+        self._hidden_state = {}
         self.setup_table()
 
     def setup_table(self):
@@ -1010,11 +1051,17 @@ class VRYTableWidget(QTableWidget):
             return
         # Reset separator flag so the next streaming batch starts fresh.
         self._separator_added = False
-        self.setRowCount(0)
-        for row_data in data:
-            row_position = self.rowCount()
-            self.insertRow(row_position)
-            self._populate_row(row_position, row_data, metadata)
+        # Suspend sorting while populating so setItem doesn't re-sort per cell
+        was_sorting = self.isSortingEnabled()
+        self.setSortingEnabled(False)
+        try:
+            self.setRowCount(0)
+            for row_data in data:
+                row_position = self.rowCount()
+                self.insertRow(row_position)
+                self._populate_row(row_position, row_data, metadata)
+        finally:
+            self.setSortingEnabled(was_sorting)
         self._update_column_visibility(metadata)
 
     def _populate_row(self, row_position, row_data, metadata):
@@ -1023,7 +1070,7 @@ class VRYTableWidget(QTableWidget):
                 raw = ""
             raw_text = str(raw)
             m = ANSI_RGB_RE.search(raw_text)
-            clean = ANSI_ANY_RE.sub("", raw_text)
+            clean = strip_ansi(raw_text)
             item = QTableWidgetItem(clean)
             if m:
                 try:
@@ -1036,7 +1083,7 @@ class VRYTableWidget(QTableWidget):
         def format_rank(rank_text, act, ep):
             if not rank_text or "Unranked" in str(rank_text):
                 return rank_text
-            clean = ANSI_ANY_RE.sub("", str(rank_text))
+            clean = strip_ansi(str(rank_text))
             return f"{clean} {ep}A{act}" if act and ep else rank_text
 
         privacy = metadata.get('incognito_privacy', True)
@@ -1065,7 +1112,7 @@ class VRYTableWidget(QTableWidget):
         name_val = str(row_data.get("name", ""))
         if incognito and not is_self and not is_party:
             if not name_val:
-                agent_val = ANSI_ANY_RE.sub("", str(row_data.get("agent", ""))) or "???"
+                agent_val = strip_ansi(str(row_data.get("agent", ""))) or "???"
                 item = QTableWidgetItem(agent_val)
                 _f = QFont("Segoe UI", 9)
                 _f.setItalic(True)
@@ -1089,6 +1136,8 @@ class VRYTableWidget(QTableWidget):
                     item.setForeground(QColor(0, 255, 127))
                 else:
                     item.setForeground(QColor(255, 69, 0))
+        # Keep the row data so _apply_incognito can update the cell in place
+        item.setData(Qt.ItemDataRole.UserRole, row_data)
         self.setItem(row_position, 2, item)
 
         # Skin
@@ -1123,18 +1172,15 @@ class VRYTableWidget(QTableWidget):
 
         # HS%
         hs = row_data.get("hs", "N/A")
-        if hs != "N/A":
-            try:
-                hs_val = float(hs)
-                item = QTableWidgetItem(f"{hs_val:.0f}%")
-                if hs_val < 20:
-                    item.setForeground(QColor(200, 60, 60))
-                elif hs_val < 30:
-                    item.setForeground(QColor(220, 190, 60))
-                else:
-                    item.setForeground(QColor(60, 200, 100))
-            except (ValueError, TypeError):
-                item = QTableWidgetItem("N/A")
+        hs_val = safe_float(hs) if hs != "N/A" else None
+        if hs_val is not None:
+            item = QTableWidgetItem(f"{hs_val:.0f}%")
+            if hs_val < 20:
+                item.setForeground(QColor(200, 60, 60))
+            elif hs_val < 30:
+                item.setForeground(QColor(220, 190, 60))
+            else:
+                item.setForeground(QColor(60, 200, 100))
         else:
             item = QTableWidgetItem("N/A")
         item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -1143,18 +1189,15 @@ class VRYTableWidget(QTableWidget):
         # WR%
         wr = row_data.get("wr", "N/A")
         games = row_data.get("games", 0)
-        if wr not in ("N/A", "N/a"):
-            try:
-                wr_val = int(wr)
-                item = QTableWidgetItem(f"{wr_val}% ({games})")
-                if wr_val < 45:
-                    item.setForeground(QColor(200, 60, 60))
-                elif wr_val > 55:
-                    item.setForeground(QColor(60, 200, 100))
-                else:
-                    item.setForeground(QColor(220, 220, 220))
-            except (ValueError, TypeError):
-                item = QTableWidgetItem(f"N/A ({games})")
+        wr_val = safe_int(wr) if wr not in ("N/A", "N/a") else None
+        if wr_val is not None:
+            item = QTableWidgetItem(f"{wr_val}% ({games})")
+            if wr_val < 45:
+                item.setForeground(QColor(200, 60, 60))
+            elif wr_val > 55:
+                item.setForeground(QColor(60, 200, 100))
+            else:
+                item.setForeground(QColor(220, 220, 220))
         else:
             item = QTableWidgetItem(f"N/A ({games})")
         item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -1162,20 +1205,17 @@ class VRYTableWidget(QTableWidget):
 
         # K/D
         kd = row_data.get("kd", "N/A")
-        if kd != "N/A":
-            try:
-                kd_val = float(kd)
-                item = QTableWidgetItem(f"{kd_val:.2f}")
-                if kd_val >= 2.0:
-                    item.setForeground(QColor(255, 215, 0))
-                elif kd_val >= 1.2:
-                    item.setForeground(QColor(60, 200, 100))
-                elif kd_val >= 0.8:
-                    item.setForeground(QColor(220, 220, 220))
-                else:
-                    item.setForeground(QColor(200, 60, 60))
-            except (ValueError, TypeError):
-                item = QTableWidgetItem("N/A")
+        kd_val = safe_float(kd) if kd != "N/A" else None
+        if kd_val is not None:
+            item = QTableWidgetItem(f"{kd_val:.2f}")
+            if kd_val >= 2.0:
+                item.setForeground(QColor(255, 215, 0))
+            elif kd_val >= 1.2:
+                item.setForeground(QColor(60, 200, 100))
+            elif kd_val >= 0.8:
+                item.setForeground(QColor(220, 220, 220))
+            else:
+                item.setForeground(QColor(200, 60, 60))
         else:
             item = QTableWidgetItem("N/A")
         item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -1192,13 +1232,11 @@ class VRYTableWidget(QTableWidget):
         # ΔRR
         earned = row_data.get("earned_rr", "N/A")
         afk = row_data.get("afk_penalty", "N/A")
-        if earned != "N/A" and afk != "N/A":
-            try:
-                text = f"{int(earned):+d}" + (f" ({afk})" if afk != 0 else "")
-                item = QTableWidgetItem(text)
-                item.setForeground(QColor(0, 255, 0) if int(earned) > 0 else QColor(255, 0, 0) if int(earned) < 0 else QColor(255, 255, 255))
-            except (ValueError, TypeError):
-                item = QTableWidgetItem("")
+        earned_val = safe_int(earned) if earned != "N/A" and afk != "N/A" else None
+        if earned_val is not None:
+            text = f"{earned_val:+d}" + (f" ({afk})" if afk != 0 else "")
+            item = QTableWidgetItem(text)
+            item.setForeground(QColor(0, 255, 0) if earned_val > 0 else QColor(255, 0, 0) if earned_val < 0 else QColor(255, 255, 255))
         else:
             item = QTableWidgetItem("")
         item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -1228,11 +1266,44 @@ class VRYTableWidget(QTableWidget):
                 else:
                     cell.setFont(normal_font)
 
+    def _apply_incognito(self, enabled):
+        """Re-apply the incognito privacy setting to existing rows in place.
+
+        Only the Name and Level cells depend on the privacy toggle, so update
+        their text/colour instead of rebuilding every cell of every row.
+        """
+        if self.is_frozen:
+            return
+        for row in range(self.rowCount()):
+            name_item = self.item(row, 2)
+            if not name_item:
+                continue
+            row_data = name_item.data(Qt.ItemDataRole.UserRole)
+            if not isinstance(row_data, dict):
+                continue
+            if row_data.get("is_self") or row_data.get("is_party"):
+                continue
+
+            name_val = str(row_data.get("name", ""))
+            if row_data.get("incognito") and name_val:
+                if enabled:
+                    name_item.setText("Incognito")
+                    name_item.setForeground(QColor(128, 0, 0))
+                else:
+                    name_item.setText(strip_ansi("*" + name_val))
+                    name_item.setForeground(QColor(200, 200, 200))
+
+            level_item = self.item(row, 12)
+            if level_item and row_data.get("hide_level"):
+                level_item.setText("" if enabled else str(row_data.get("level", "")))
+
     def _update_column_visibility(self, metadata):
         state = metadata.get("state", "")
-        self.setColumnHidden(0, state == "MENUS")
-        self.setColumnHidden(1, state == "MENUS")
-        self.setColumnHidden(3, state in ("MENUS", "PREGAME"))
+        in_menus = state == "MENUS"
+        for col, hidden in ((0, in_menus), (1, in_menus), (3, in_menus or state == "PREGAME")):
+            if self._hidden_state.get(col) != hidden:
+                self.setColumnHidden(col, hidden)
+                self._hidden_state[col] = hidden
 
 
 class VRYMainWindow(QMainWindow):
@@ -1253,13 +1324,15 @@ class VRYMainWindow(QMainWindow):
         self.show_resource_warning = self.config.get_feature_flag("show_resource_warning")
         self._last_status_time = time.time()
 
-        self.init_ui()
-        self.load_settings()
-
+        # Before load_settings: restoring a maximized geometry already goes through changeEvent
+        self.resource_timer = None
         if PSUTIL_AVAILABLE and self.show_resource_warning:
-            self.resource_timer = QTimer()
+            self.resource_timer = QTimer(self)
             self.resource_timer.timeout.connect(self.monitor_resources)
-            self.resource_timer.start(60000)
+            # Started/stopped with window visibility in _update_resource_timer
+
+        self.init_ui()
+        self.load_settings()
 
         self._watchdog_timer = QTimer(self)
         self._watchdog_timer.timeout.connect(self._check_worker_watchdog)
@@ -1272,13 +1345,41 @@ class VRYMainWindow(QMainWindow):
             return
         try:
             mem = psutil.virtual_memory()
-            cpu = psutil.cpu_percent(interval=0.1)
+            # Non-blocking: usage since the previous call (primed on timer start)
+            cpu = psutil.cpu_percent(interval=None)
             if mem.percent > 90 or cpu > 95:
                 QMessageBox.warning(self, "High Resource Usage",
                     f"Memory: {mem.percent:.1f}%\nCPU: {cpu:.1f}%")
         except Exception:
             pass
 
+    def _update_resource_timer(self):
+        """Only poll system resources while the window is actually visible."""
+        if not self.resource_timer:
+            return
+        if self.isVisible() and not self.isMinimized():
+            if not self.resource_timer.isActive():
+                try:
+                    psutil.cpu_percent(interval=None)  # prime the next sample
+                except Exception:
+                    pass
+                self.resource_timer.start(60000)
+        else:
+            self.resource_timer.stop()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_resource_timer()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._update_resource_timer()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self._update_resource_timer()
+
     def init_ui(self):
         self.setWindowTitle("VRY - UI v2.15")
         self.setGeometry(100, 100, 1400, 850)
@@ -1420,13 +1521,15 @@ class VRYMainWindow(QMainWindow):
         view_menu = menubar.addMenu('View')
 
         theme_menu = view_menu.addMenu('Theme')
-        self.theme_group = []
+        self.theme_group = QActionGroup(self)
+        self.theme_group.setExclusive(True)
+        self.theme_group.triggered.connect(lambda action: self.change_theme(action.data()))
         for name in THEMES:
             action = QAction(name, self)
             action.setCheckable(True)
-            action.triggered.connect(lambda c, t=name: self.change_theme(t))
+            action.setData(name)
+            self.theme_group.addAction(action)
             theme_menu.addAction(action)
-            self.theme_group.append(action)
 
         view_menu.addSeparator()
 
@@ -1500,8 +1603,11 @@ class VRYMainWindow(QMainWindow):
         if name in THEMES:
             self.apply_theme(THEMES[name])
             self.settings.setValue("theme", name)
-            for action in self.theme_group:
-                action.setChecked(action.text() == name)
+            # The group is exclusive, so checking one action unchecks the rest
+            for action in self.theme_group.actions():
+                if action.data() == name:
+                    action.setChecked(True)
+                    break
 
     def toggle_console_tab(self, checked):
         if checked:
@@ -1577,11 +1683,11 @@ class VRYMainWindow(QMainWindow):
         text = self.vtl_search.text().strip()
         if not text:
             return
-        if '#' in text:
-            user, tag = text.split('#', 1)
-            self.vtl_web.load(QUrl(f"https://vtl.lol/id/{user}_{tag}"))
-        elif re.match(r"^[0-9a-fA-F-]{36}$", text):
-            self.vtl_web.load(QUrl(f"https://vtl.lol/id/{text}"))
+        m = VTL_LOOKUP_RE.match(text)
+        if m and m.group('user'):
+            self.vtl_web.load(QUrl(f"https://vtl.lol/id/{m.group('user')}_{m.group('tag')}"))
+        elif m:
+            self.vtl_web.load(QUrl(f"https://vtl.lol/id/{m.group('puuid')}"))
         else:
             self.status_bar.showMessage("Invalid format. Use Username#Tag", 3000)
 
@@ -1847,13 +1953,12 @@ class VRYMainWindow(QMainWindow):
         self.status_label.setText(text)
 
     def on_incognito_changed(self, checked):
-        """Re-render the current table data with the new privacy setting."""
+        """Apply the new privacy setting to the rows already in the table."""
         self.settings.setValue("incognito_privacy", checked)
-        if self.player_table_data:
-            md = dict(self.player_table_metadata)
-            md['incognito_privacy'] = checked
-            self.player_table_metadata = md
-            self.player_table.update_table(self.player_table_data, md)
+        md = dict(self.player_table_metadata)
+        md['incognito_privacy'] = checked
+        self.player_table_metadata = md
+        self.player_table._apply_incognito(checked)
 
     def load_settings(self):
         geom = self.settings.value("geometry")
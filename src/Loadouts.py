@@ -1,14 +1,16 @@
 import sys
 import time
 import asyncio
-import aiohttp
 from colr import color
-from src.constants import sockets, hide_names
-from threading import Lock
+from src import valapi_cache, _loadouts_convert
+from threading import Lock, Thread
 
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
+# valorant-api.com catalogs used to build match loadouts
+LOADOUT_CATALOGS = ("weapons", "sprays", "agents", "playertitles", "playercards", "buddies")
+
 
 class Loadouts:
     def __init__(self, Requests, log, colors, Server, current_map):
@@ -18,21 +20,22 @@ class Loadouts:
         self.Server = Server
         self.current_map = current_map
 
+        # The whole buddy catalog (buddies + levels); bounded by the catalog itself
         self.buddy_cache = {}
         self.cache_lock = Lock()
-        
-        # Lazy session creation
-        self._session = None
-        self._loop = None
-        self._session_lock = Lock()
-        
-        # Cache static API data
-        self._weapons_cache = None
-        self._sprays_cache = None
-        self._agents_cache = None
-        self._titles_cache = None
-        self._playercards_cache = None
-        
+        self._cache_stats = {"hit": 0, "miss": 0}
+
+        # (weapon, skin) -> skin and (weapon, skin, chroma) -> chroma uuid keys,
+        # built once from the weapons catalog
+        self._skin_index = None
+        self._chroma_index = None
+        self._skin_index_source = None
+        # Buddy uuids already reported as missing from the catalog
+        self._missing_buddies = set()
+
+        # Warm the catalog cache in the background, long before the first match
+        Thread(target=valapi_cache.preload, args=(LOADOUT_CATALOGS, self.log), daemon=True).start()
+
     def _get_loop(self):
         """Get or create event loop for current thread"""
         try:
@@ -42,89 +45,73 @@ class Loadouts:
             asyncio.set_event_loop(loop)
             return loop
 
-    async def _get_session(self):
-        """Get or create aiohttp session"""
-        if self._session is None or self._session.closed:
-            timeout = aiohttp.ClientTimeout(total=30, connect=10)
-            connector = aiohttp.TCPConnector(limit=10, limit_per_host=5)
-            self._session = aiohttp.ClientSession(timeout=timeout, connector=connector)
-        return self._session
-
-    async def _preload_buddies(self):
+    def _preload_buddies(self):
         """Preload buddy data into cache"""
-        try:
-            session = await self._get_session()
-            async with session.get("https://valorant-api.com/v1/buddies") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get("status") == 200 and data.get("data"):
-                        with self.cache_lock:
-                            for buddy in data["data"]:
-                                self.buddy_cache[buddy["uuid"]] = {
-                                    "displayName": buddy["displayName"],
-                                    "displayIcon": buddy["displayIcon"]
-                                }
-                        self.log(f"Cached {len(self.buddy_cache)} buddies")
-        except Exception as e:
-            self.log(f"Failed to preload buddies: {e}")
+        buddies = self._get_catalog("buddies")
+        if not buddies:
+            return
+        with self.cache_lock:
+            for buddy in buddies:
+                info = {
+                    "displayName": buddy["displayName"],
+                    "displayIcon": buddy["displayIcon"]
+                }
+                self.buddy_cache[buddy["uuid"]] = info
+                # Loadout sockets may reference a buddy level rather than the buddy
+                for level in buddy.get("levels") or []:
+                    self.buddy_cache[level["uuid"]] = info
+        self.log(f"Cached {len(self.buddy_cache)} buddies")
+
+    def get_cache_stats(self):
+        """Buddy cache hit/miss counters and size, for debug logging"""
+        with self.cache_lock:
+            return dict(self._cache_stats, size=len(self.buddy_cache))
 
-    async def _get_cached_api_data(self, endpoint, cache_attr):
-        """Fetch and cache API data"""
-        cached = getattr(self, cache_attr, None)
-        if cached:
-            return cached
-            
+    def _get_catalog(self, endpoint):
+        """Get a static valorant-api.com catalog from the process-wide cache"""
         try:
-            session = await self._get_session()
-            async with session.get(f"https://valorant-api.com/v1/{endpoint}") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    setattr(self, cache_attr, data)
-                    return data
+            return valapi_cache.get_catalog(endpoint)
         except Exception as e:
             self.log(f"API fetch error ({endpoint}): {e}")
         return None
 
+    def _get_skin_indexes(self, weapons):
+        """Build the nested skin/chroma lookups once from the weapons catalog"""
+        if self._skin_index_source is not weapons:
+            skin_index = {}
+            chroma_index = {}
+            for weapon in weapons:
+                for skin in weapon["skins"]:
+                    skin_index[(weapon["uuid"], skin["uuid"])] = skin
+                    for chroma in skin["chromas"]:
+                        chroma_index[(weapon["uuid"], skin["uuid"], chroma["uuid"])] = chroma
+            self._skin_index = skin_index
+            self._chroma_index = chroma_index
+            self._skin_index_source = weapons
+        return self._skin_index, self._chroma_index
+
+    def _get_catalogs(self, *endpoints):
+        """Fetch several catalogs, downloading the ones not in memory yet concurrently"""
+        catalogs = valapi_cache.preload(endpoints, self.log)
+        return [catalogs[endpoint] for endpoint in endpoints]
+
     async def get_buddy_info_batch(self, buddy_uuids):
         if not buddy_uuids:
             return {}
 
+        # The preloaded catalog is complete, so a miss is not worth an HTTP call
         results = {}
-        uncached = []
-
         with self.cache_lock:
             for uuid in buddy_uuids:
-                if uuid in self.buddy_cache:
-                    results[uuid] = self.buddy_cache[uuid]
-                else:
-                    uncached.append(uuid)
-
-        if not uncached:
-            return results
-
-        session = await self._get_session()
-        
-        async def fetch_buddy(uuid):
-            try:
-                async with session.get(f"https://valorant-api.com/v1/buddies/{uuid}") as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if data.get("status") == 200 and data.get("data"):
-                            info = {
-                                "displayName": data["data"]["displayName"],
-                                "displayIcon": data["data"]["displayIcon"]
-                            }
-                            with self.cache_lock:
-                                self.buddy_cache[uuid] = info
-                            return uuid, info
-            except Exception:
-                pass
-            return uuid, None
-
-        fetch_results = await asyncio.gather(*[fetch_buddy(u) for u in uncached])
-        for uuid, info in fetch_results:
-            if info:
-                results[uuid] = info
+                info = self.buddy_cache.get(uuid)
+                if info:
+                    self._cache_stats["hit"] += 1
+                    results[uuid] = info
+                    continue
+                self._cache_stats["miss"] += 1
+                if uuid not in self._missing_buddies:
+                    self._missing_buddies.add(uuid)
+                    self.log(f"Buddy {uuid} not found in catalog")
 
         return results
 
@@ -133,21 +120,22 @@ class Loadouts:
         
         # Preload buddies on first call
         if not self.buddy_cache:
-            loop.run_until_complete(self._preload_buddies())
+            self._preload_buddies()
             
-        return loop.run_until_complete(
+        result = loop.run_until_complete(
             self._get_match_loadouts_async(match_id, players, weaponChoose, valoApiSkins, names, state)
         )
+        self.log(f"Buddy cache stats: {self.get_cache_stats()}")
+        return result
 
     async def _get_match_loadouts_async(self, match_id, players, weaponChoose, valoApiSkins, names, state="game"):
         playersBackup = players
         weaponLists = {}
 
         # Get weapons from cache or fetch
-        weapons_data = await self._get_cached_api_data("weapons", "_weapons_cache")
-        if not weapons_data:
+        valApiWeapons = self._get_catalog("weapons")
+        if not valApiWeapons:
             return [{}, {}]
-        valApiWeapons = weapons_data
 
         if state == "game":
             team_id = "Blue"
@@ -158,24 +146,27 @@ class Loadouts:
             team_id = pregame_stats['Teams'][0]['TeamID']
             PlayerInventorys = self.Requests.fetch("glz", f"/pregame/v1/matches/{match_id}/loadouts", "get")
 
-        for i, player in enumerate(players):
-            if team_id == "Red":
-                invindex = i + len(players) - len(PlayerInventorys["Loadouts"])
-            else:
-                invindex = i
-            inv = PlayerInventorys["Loadouts"][invindex]
-            if state == "game":
-                inv = inv["Loadout"]
-                
-            for weapon in valApiWeapons["data"]:
-                if weapon["displayName"].lower() == weaponChoose.lower():
-                    skin_id = inv["Items"][weapon["uuid"].lower()]["Sockets"]["bcef87d6-209b-46c6-8b19-fbe40bd95abc"]["Item"]["ID"]
-                    for skin in valoApiSkins.json()["data"]:
-                        if skin_id.lower() == skin["uuid"].lower():
-                            rgb_color = self.colors.get_rgb_color_from_skin(skin["uuid"].lower(), valoApiSkins)
-                            skin_display_name = skin["displayName"].replace(f" {weapon['displayName']}", "")
-                            weaponLists[players[i]["Subject"]] = color(skin_display_name, fore=rgb_color)
-                    break
+        loadouts = PlayerInventorys["Loadouts"]
+        # Red team players sit at the end of the loadouts list
+        offset = len(players) - len(loadouts) if team_id == "Red" else 0
+        chosen = weaponChoose.lower()
+        weapon = next((w for w in valApiWeapons if w["displayName"].lower() == chosen), None)
+
+        if weapon:
+            weapon_uuid = weapon["uuid"].lower()
+            weapon_suffix = f" {weapon['displayName']}"
+            for i, player in enumerate(players):
+                inv = loadouts[i + offset]
+                if state == "game":
+                    inv = inv["Loadout"]
+
+                skin_id = inv["Items"][weapon_uuid]["Sockets"]["bcef87d6-209b-46c6-8b19-fbe40bd95abc"]["Item"]["ID"].lower()
+                for skin in valoApiSkins:
+                    if skin_id == skin["uuid"].lower():
+                        rgb_color = self.colors.get_rgb_color_from_tier(skin.get("contentTierUuid"))
+                        skin_display_name = skin["displayName"].replace(weapon_suffix, "")
+                        weaponLists[player["Subject"]] = color(skin_display_name, fore=rgb_color)
+                        break
 
         final_json = await self.convertLoadoutToJsonArray(PlayerInventorys, playersBackup, state, names, valApiWeapons)
         self.log(f"Loadout JSON generated for {len(final_json.get('Players', {}))} players")
@@ -185,160 +176,58 @@ class Loadouts:
     async def convertLoadoutToJsonArray(self, PlayerInventorys, players, state, names, valApiWeapons):
         try:
             # Fetch all API data concurrently with caching
-            sprays_data, agents_data, titles_data, cards_data = await asyncio.gather(
-                self._get_cached_api_data("sprays", "_sprays_cache"),
-                self._get_cached_api_data("agents", "_agents_cache"),
-                self._get_cached_api_data("playertitles", "_titles_cache"),
-                self._get_cached_api_data("playercards", "_playercards_cache")
+            sprays_data, agents_data, titles_data, cards_data = self._get_catalogs(
+                "sprays", "agents", "playertitles", "playercards"
             )
             
             if not all([sprays_data, agents_data, titles_data, cards_data]):
-                return {"Players": {}, "time": int(time.time()), "map": self.current_map}
-                
-            valoApiSprays = sprays_data
-            valoApiAgents = agents_data
-            valoApiTitles = titles_data
-            valoApiPlayerCards = cards_data
-            
+                return self._loadout_payload({})
+
+            sprays_by_uuid = valapi_cache.get_index("sprays")
+            agents_by_uuid = valapi_cache.get_index("agents")
+            titles_by_uuid = valapi_cache.get_index("playertitles")
+            cards_by_uuid = valapi_cache.get_index("playercards")
+            weapons_by_uuid = valapi_cache.get_index("weapons")
+            skin_index, chroma_index = self._get_skin_indexes(valApiWeapons)
+
         except Exception as e:
             self.log(f"Error fetching API data: {e}")
-            return {"Players": {}, "time": int(time.time()), "map": self.current_map}
-
-        final_final_json = {
-            "Players": {},
+            return self._loadout_payload({})
+
+        if state != "game":
+            return self._loadout_payload({})
+
+        loadouts = PlayerInventorys["Loadouts"]
+        buddy_info_map = await self.get_buddy_info_batch(list(_loadouts_convert.collect_buddy_uuids(loadouts)))
+
+        lookups = {
+            "agents": agents_by_uuid,
+            "titles": titles_by_uuid,
+            "cards": cards_by_uuid,
+            "sprays": sprays_by_uuid,
+            "weapons": weapons_by_uuid,
+            "skins": skin_index,
+            "chromas": chroma_index,
+            "buddies": buddy_info_map,
+        }
+        return self._loadout_payload(_loadouts_convert.build_players(loadouts, players, names, lookups))
+
+    def _loadout_payload(self, players_by_subject):
+        """
+        matchLoadout payload. "PlayersList" carries the same entries as a list with
+        their "Subject"; "Players" (keyed by subject) is deprecated and kept until
+        the website reads the list.
+        """
+        return {
+            "Players": players_by_subject,
+            "PlayersList": _loadouts_convert.players_list(players_by_subject),
             "time": int(time.time()),
             "map": self.current_map
         }
-        final_json = final_final_json["Players"]
-
-        if state == "game":
-            PlayerInventorys = PlayerInventorys["Loadouts"]
-
-            # Collect all buddy UUIDs
-            all_buddy_uuids = set()
-            for inv_data in PlayerInventorys:
-                inv = inv_data["Loadout"]
-                for skin in inv["Items"]:
-                    for socket in inv["Items"][skin]["Sockets"]:
-                        if socket == sockets["skin_buddy"]:
-                            buddy_uuid = inv["Items"][skin]["Sockets"][socket]["Item"]["ID"]
-                            if buddy_uuid:
-                                all_buddy_uuids.add(buddy_uuid)
-
-            buddy_info_map = await self.get_buddy_info_batch(list(all_buddy_uuids))
-
-            for i, inv_data in enumerate(PlayerInventorys):
-                PlayerInventory = inv_data["Loadout"]
-                player_subject = players[i]["Subject"]
-
-                final_json[player_subject] = {}
-
-                # Name
-                if hide_names:
-                    for agent in valoApiAgents["data"]:
-                        if agent["uuid"] == players[i]["CharacterID"]:
-                            final_json[player_subject]["Name"] = agent["displayName"]
-                            break
-                else:
-                    final_json[player_subject]["Name"] = names.get(player_subject, "Unknown")
-
-                final_json[player_subject]["Team"] = players[i]["TeamID"]
-                final_json[player_subject]["Level"] = players[i]["PlayerIdentity"]["AccountLevel"]
-
-                # Title
-                for title in valoApiTitles["data"]:
-                    if title["uuid"] == players[i]["PlayerIdentity"]["PlayerTitleID"]:
-                        final_json[player_subject]["Title"] = title["titleText"]
-                        break
-
-                # Player Card
-                for card in valoApiPlayerCards["data"]:
-                    if card["uuid"] == players[i]["PlayerIdentity"]["PlayerCardID"]:
-                        final_json[player_subject]["PlayerCard"] = card["largeArt"]
-                        break
-
-                # Agent
-                for agent in valoApiAgents["data"]:
-                    if agent["uuid"] == players[i]["CharacterID"]:
-                        final_json[player_subject]["AgentArtworkName"] = agent["displayName"] + "Artwork"
-                        final_json[player_subject]["Agent"] = agent["displayIcon"]
-                        break
-
-                # Sprays
-                final_json[player_subject]["Sprays"] = {}
-                spray_selections = [
-                    s for s in PlayerInventory.get("Expressions", {}).get("AESSelections", [])
-                    if s.get("TypeID") == "d5f120f8-ff8c-4aac-92ea-f2b5acbe9475"
-                ]
-                for j, spray in enumerate(spray_selections):
-                    final_json[player_subject]["Sprays"][j] = {}
-                    for sprayApi in valoApiSprays["data"]:
-                        if spray["AssetID"].lower() == sprayApi["uuid"].lower():
-                            final_json[player_subject]["Sprays"][j] = {
-                                "displayName": sprayApi["displayName"],
-                                "displayIcon": sprayApi["displayIcon"],
-                                "fullTransparentIcon": sprayApi["fullTransparentIcon"]
-                            }
-                            break
-
-                # Weapons
-                final_json[player_subject]["Weapons"] = {}
-
-                for skin in PlayerInventory["Items"]:
-                    final_json[player_subject]["Weapons"][skin] = {}
-
-                    for socket in PlayerInventory["Items"][skin]["Sockets"]:
-                        for var_socket in sockets:
-                            if socket == sockets[var_socket]:
-                                final_json[player_subject]["Weapons"][skin][var_socket] = \
-                                    PlayerInventory["Items"][skin]["Sockets"][socket]["Item"]["ID"]
-
-                    # Buddy info
-                    buddy_uuid = None
-                    for socket in PlayerInventory["Items"][skin]["Sockets"]:
-                        if socket == sockets["skin_buddy"]:
-                            buddy_uuid = PlayerInventory["Items"][skin]["Sockets"][socket]["Item"]["ID"]
-                            break
-
-                    if buddy_uuid and buddy_uuid in buddy_info_map:
-                        info = buddy_info_map[buddy_uuid]
-                        final_json[player_subject]["Weapons"][skin].update({
-                            "buddy_uuid": buddy_uuid,
-                            "buddy_displayName": info["displayName"],
-                            "buddy_displayIcon": info["displayIcon"]
-                        })
-
-                    # Weapon and skin info
-                    for weapon in valApiWeapons["data"]:
-                        if skin == weapon["uuid"]:
-                            final_json[player_subject]["Weapons"][skin]["weapon"] = weapon["displayName"]
-
-                            skin_uuid = PlayerInventory["Items"][skin]["Sockets"][sockets["skin"]]["Item"]["ID"]
-                            for skinApi in weapon["skins"]:
-                                if skinApi["uuid"] == skin_uuid:
-                                    final_json[player_subject]["Weapons"][skin]["skinDisplayName"] = skinApi["displayName"]
-
-                                    chroma_uuid = PlayerInventory["Items"][skin]["Sockets"][sockets["skin_chroma"]]["Item"]["ID"]
-                                    for chroma in skinApi["chromas"]:
-                                        if chroma["uuid"] == chroma_uuid:
-                                            icon = chroma.get("displayIcon") or chroma.get("fullRender") or \
-                                                   skinApi.get("displayIcon") or skinApi["levels"][0].get("displayIcon")
-                                            final_json[player_subject]["Weapons"][skin]["skinDisplayIcon"] = icon
-                                            break
-
-                                    if skinApi["displayName"].startswith(("Standard", "Melee")):
-                                        final_json[player_subject]["Weapons"][skin]["skinDisplayIcon"] = weapon["displayIcon"]
-                                    break
-                            break
-
-        return final_final_json
 
     def close(self):
-        """Close the aiohttp session"""
-        if self._session and not self._session.closed:
-            try:
-                loop = self._get_loop()
-                loop.run_until_complete(self._session.close())
-            except Exception:
-                pass
-        self._session = None
+        """Drop cached buddy lookups"""
+        with self.cache_lock:
+            self.buddy_cache.clear()
+            self._missing_buddies.clear()
+            self._cache_stats = {"hit": 0, "miss": 0}
@@ -0,0 +1,152 @@
+"""
+Pure conversion of match loadouts into the overlay's matchLoadout payload.
+
+Kept free of I/O and of the Loadouts instance: everything it needs comes in
+through the arguments as read-only lookups, so it is safe to run per player
+in worker threads and fully annotated for an AOT compiler (mypyc/Cython).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from src.constants import sockets, hide_names
+
+# socket uuid -> socket name, and the socket uuids read in the hot loop
+NAMED_SOCKET_BY_UUID: dict[str, str] = {uuid: name for name, uuid in sockets.items()}
+SKIN_SOCKET: str = sockets["skin"]
+CHROMA_SOCKET: str = sockets["skin_chroma"]
+BUDDY_SOCKET: str = sockets["skin_buddy"]
+SPRAY_TYPE_ID = "d5f120f8-ff8c-4aac-92ea-f2b5acbe9475"
+
+
+def collect_buddy_uuids(loadouts: list[dict[str, Any]]) -> set[str]:
+    """Every buddy uuid equipped in a core-game Loadouts list."""
+    buddy_uuids: set[str] = set()
+    for inv_data in loadouts:
+        for item in inv_data["Loadout"]["Items"].values():
+            buddy_socket = item["Sockets"].get(BUDDY_SOCKET)
+            if buddy_socket and buddy_socket["Item"]["ID"]:
+                buddy_uuids.add(buddy_socket["Item"]["ID"])
+    return buddy_uuids
+
+
+def build_player_entry(player: dict[str, Any], inv_data: dict[str, Any], names: dict[str, str],
+                       lookups: dict[str, dict[Any, Any]]) -> tuple[str, dict[str, Any]]:
+    """
+    Build the loadout entry of a single player.
+    :param lookups: uuid indexes "agents", "titles", "cards", "sprays", "weapons", "buddies",
+        plus the (weapon, skin) "skins" and (weapon, skin, chroma) "chromas" indexes.
+    :return: (player subject, entry dict)
+    """
+    PlayerInventory: dict[str, Any] = inv_data["Loadout"]
+    player_subject: str = player["Subject"]
+
+    agent = lookups["agents"].get(player["CharacterID"])
+    identity: dict[str, Any] = player["PlayerIdentity"]
+
+    # Sprays
+    sprays: dict[int, dict[str, Any]] = {}
+    spray_selections = [
+        s for s in PlayerInventory.get("Expressions", {}).get("AESSelections", [])
+        if s.get("TypeID") == SPRAY_TYPE_ID
+    ]
+    for j, spray in enumerate(spray_selections):
+        sprayApi = lookups["sprays"].get(spray["AssetID"].lower())
+        sprays[j] = {
+            "displayName": sprayApi["displayName"],
+            "displayIcon": sprayApi["displayIcon"],
+            "fullTransparentIcon": sprayApi["fullTransparentIcon"]
+        } if sprayApi else {}
+
+    # Weapons
+    weapons: dict[str, dict[str, Any]] = {}
+    for skin, item in PlayerInventory["Items"].items():
+        weapon_entry: dict[str, Any] = {}
+
+        # One pass over the sockets collects every id needed below
+        skin_uuid = chroma_uuid = buddy_uuid = None
+        for socket, socket_data in item["Sockets"].items():
+            var_socket = NAMED_SOCKET_BY_UUID.get(socket)
+            if var_socket:
+                item_id = socket_data["Item"]["ID"]
+                weapon_entry[var_socket] = item_id
+                if socket == SKIN_SOCKET:
+                    skin_uuid = item_id
+                elif socket == CHROMA_SOCKET:
+                    chroma_uuid = item_id
+                elif socket == BUDDY_SOCKET:
+                    buddy_uuid = item_id
+
+        # Buddy info
+        info = lookups["buddies"].get(buddy_uuid) if buddy_uuid else None
+        if info:
+            weapon_entry["buddy_uuid"] = buddy_uuid
+            weapon_entry["buddy_displayName"] = info["displayName"]
+            weapon_entry["buddy_displayIcon"] = info["displayIcon"]
+
+        # Weapon and skin info
+        weapon = lookups["weapons"].get(skin)
+        if weapon:
+            weapon_entry["weapon"] = weapon["displayName"]
+
+            skinApi = lookups["skins"].get((skin, skin_uuid))
+            if skinApi:
+                weapon_entry["skinDisplayName"] = skinApi["displayName"]
+
+                if skinApi["displayName"].startswith(("Standard", "Melee")):
+                    weapon_entry["skinDisplayIcon"] = weapon["displayIcon"]
+                else:
+                    chroma = lookups["chromas"].get((skin, skin_uuid, chroma_uuid))
+                    if chroma:
+                        weapon_entry["skinDisplayIcon"] = chroma.get("displayIcon") or chroma.get("fullRender") or \
+                            skinApi.get("displayIcon") or skinApi["levels"][0].get("displayIcon")
+
+        weapons[skin] = weapon_entry
+
+    # All always-present keys in one literal; the optional ones are only
+    # added when the catalogs know them, as the overlay expects
+    entry: dict[str, Any] = {
+        "Team": player["TeamID"],
+        "Level": identity["AccountLevel"],
+        "Sprays": sprays,
+        "Weapons": weapons,
+    }
+
+    # Name
+    if not hide_names:
+        entry["Name"] = names.get(player_subject, "Unknown")
+    elif agent:
+        entry["Name"] = agent["displayName"]
+
+    title = lookups["titles"].get(identity["PlayerTitleID"])
+    if title:
+        entry["Title"] = title["titleText"]
+
+    card = lookups["cards"].get(identity["PlayerCardID"])
+    if card:
+        entry["PlayerCard"] = card["largeArt"]
+
+    if agent:
+        entry["AgentArtworkName"] = agent["displayName"] + "Artwork"
+        entry["Agent"] = agent["displayIcon"]
+
+    return player_subject, entry
+
+
+def build_players(loadouts: list[dict[str, Any]], players: list[dict[str, Any]], names: dict[str, str],
+                  lookups: dict[str, dict[Any, Any]]) -> dict[str, dict[str, Any]]:
+    """Convert every player's loadout; returns {subject: entry}."""
+    if not loadouts:
+        return {}
+
+    # Players don't share any mutable state, so convert them concurrently
+    with ThreadPoolExecutor(max_workers=min(10, len(loadouts))) as executor:
+        entries = executor.map(
+            lambda args: build_player_entry(*args, names, lookups),
+            zip(players, loadouts)
+        )
+        return dict(entries)
+
+
+def players_list(players_by_subject: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
+    """The {subject: entry} map as a list of entries carrying their "Subject"."""
+    return [{"Subject": subject, **entry} for subject, entry in players_by_subject.items()]
@@ -36,16 +36,8 @@ class Colors:
             Teamcolor = color(orig_name, fore=(221, 224, 41))
         return Teamcolor
 
-    def get_rgb_color_from_skin(self, skin_id, valoApiSkins):
-        try:
-            data = valoApiSkins.json()
-            if "data" not in data:
-                return None
-            for skin in data["data"]:
-                if skin_id == skin["uuid"]:
-                    return self.tier_dict.get(skin.get("contentTierUuid"))
-        except Exception:
-            return None
+    def get_rgb_color_from_tier(self, tier_uuid):
+        return self.tier_dict.get(tier_uuid)
 
     def level_to_color(self, level):
         if level >= 400:
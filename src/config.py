@@ -1,10 +1,47 @@
 import json
+import time
+from threading import Thread
+from functools import lru_cache
 from io import TextIOWrapper
-from json import JSONDecodeError
-import requests
 import os
 
-from src.constants import DEFAULT_CONFIG
+from src import fastjson, valapi_cache
+from src.constants import DEFAULT_CONFIG, DEFAULT_CONFIG_FLAGS, DEFAULT_CONFIG_TABLE, DEFAULT_CONFIG_KEYS
+
+# Weapon names only change with new weapons, a day old list is fine for validation
+WEAPON_NAMES_TTL = 24 * 60 * 60
+WEAPON_NAMES_CACHE = os.path.join(valapi_cache.CACHE_DIR, "weapon_names.json")
+
+def read_cached_weapon_names():
+    """Weapon display names from the disk cache if younger than WEAPON_NAMES_TTL, else None."""
+    try:
+        if time.time() - os.path.getmtime(WEAPON_NAMES_CACHE) < WEAPON_NAMES_TTL:
+            with open(WEAPON_NAMES_CACHE, "rb") as f:
+                return frozenset(fastjson.loads(f.read()))
+    except (OSError, ValueError):
+        pass
+    return None
+
+@lru_cache(maxsize=1)
+def load_weapon_names():
+    """
+    Weapon display names, from a fresh disk cache or else from valorant-api.com
+    (the downloaded list is written back to the cache).
+    """
+    names = read_cached_weapon_names()
+    if names is not None:
+        return names
+
+    names = frozenset(weapon["displayName"] for weapon in valapi_cache.get_catalog("weapons"))
+    try:
+        os.makedirs(os.path.dirname(WEAPON_NAMES_CACHE), exist_ok=True)
+        tmp_path = WEAPON_NAMES_CACHE + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(fastjson.dumps(sorted(names)))
+        os.replace(tmp_path, WEAPON_NAMES_CACHE)
+    except OSError:
+        pass
+    return names
 
 def apply_defaults(cls):
     for name, value in DEFAULT_CONFIG.items():
@@ -19,59 +56,63 @@ class Config:
         else:
             self.log = log
 
-        config = DEFAULT_CONFIG.copy()
-
         if not os.path.exists("config.json"):
             self.log("config.json not found, creating new one")
             with open("config.json", "w") as file:
                 config = self.config_dialog(file)
-            
-        try:
-            with open("config.json", "r") as file:
-                self.log("config opened")
-                config = json.load(file)
-
-                keys = [k for k in config.keys()]
-                default_keys = [k for k in DEFAULT_CONFIG.keys()]
-                missingkeys = list(filter(lambda x: x not in keys, default_keys))
+        else:
+            try:
+                # Read and parse once; the file is only rewritten if keys were missing
+                with open("config.json", "rb") as file:
+                    self.log("config opened")
+                    config = fastjson.loads(file.read())
+            except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError both subclass it
+                self.log("invalid file")
+                with open("config.json", "w") as file:
+                    config = self.config_dialog(file)
+            else:
+                missingkeys = DEFAULT_CONFIG_KEYS - config.keys()
 
-                if len(missingkeys) > 0:
+                if missingkeys:
                     self.log("config.json is missing keys")
-                    with open("config.json", 'w') as w:
-                        self.log(f"missing keys: " + str(missingkeys))
-                        for key in missingkeys:   
-                            config[key] = DEFAULT_CONFIG[key]
-
-                        self.log("Succesfully added missing keys")
-                        json.dump(config, w, indent=4)
-    
-        except (JSONDecodeError):
-            self.log("invalid file")
-            with open("config.json", "w") as file:
-                config = self.config_dialog(file)
-        finally:
-            config = DEFAULT_CONFIG | config
-            for name, value in config.items():
-                setattr(self, name, value)
+                    self.log(f"missing keys: " + str(missingkeys))
+                    config.update({key: DEFAULT_CONFIG[key] for key in missingkeys})
+                    self.write_config(config)
+                    self.log("Succesfully added missing keys")
+
+        # Every default key is present at this point, no need to merge again
+        for name, value in config.items():
+            setattr(self, name, value)
+
+        self.log(f"config class dict: {self.__dict__}")
+
+        self.log(f"got cooldown with value '{self.cooldown}'")
 
-            self.log(f"config class dict: {self.__dict__}")
+        # The configured weapon is kept optimistically; only a stale name cache
+        # needs the API, and that check must not hold up startup
+        cached_names = read_cached_weapon_names()
+        if cached_names is None:
+            Thread(target=self._validate_weapon, args=(config["weapon"],), daemon=True).start()
+        elif config["weapon"] not in cached_names:
+            self.weapon = "vandal"
 
-            self.log(f"got cooldown with value '{self.cooldown}'")
+    def _validate_weapon(self, name):
+        if not self.weapon_check(name):
+            self.log(f"weapon '{name}' not found, using vandal")
+            self.weapon = "vandal"
 
-            if not self.weapon_check(config["weapon"]):
-                self.weapon = "vandal"
-            else:   
-                self.weapon = config["weapon"]
+    @staticmethod
+    def write_config(config):
+        """Atomically replace config.json, so a crash never leaves it half written"""
+        with open("config.json.tmp", "w") as file:
+            json.dump(config, file, indent=4)
+        os.replace("config.json.tmp", "config.json")
             
     def get_feature_flag(self, key):
-        flags = self.__dict__.get("flags", DEFAULT_CONFIG["flags"])
-        default_value = DEFAULT_CONFIG["flags"].get(key, False)
-        return flags.get(key, default_value)
+        return self.__dict__.get("flags", DEFAULT_CONFIG_FLAGS).get(key, DEFAULT_CONFIG_FLAGS.get(key, False))
 
     def get_table_flag(self, key):
-        table = self.__dict__.get("table", DEFAULT_CONFIG["table"])
-        default_value = DEFAULT_CONFIG["table"].get(key, False)
-        return table.get(key, default_value)
+        return self.__dict__.get("table", DEFAULT_CONFIG_TABLE).get(key, DEFAULT_CONFIG_TABLE.get(key, False))
 
     def config_dialog(self, fileToWrite: TextIOWrapper):
         self.log("color config prompt called")
@@ -82,11 +123,6 @@ class Config:
 
     def weapon_check(self, name):
         try:
-            weapons_response = requests.get("https://valorant-api.com/v1/weapons", timeout=10)
-            if weapons_response.status_code == 200:
-                weapons_data = weapons_response.json()
-                if name in [weapon["displayName"] for weapon in weapons_data["data"]]:
-                    return True
+            return name in load_weapon_names()
         except Exception:
-            pass
-        return False
\ No newline at end of file
+            return False
\ No newline at end of file
@@ -190,6 +190,11 @@ DEFAULT_CONFIG = {
         }
     }
 
+# Precomputed views of DEFAULT_CONFIG for the config lookups
+DEFAULT_CONFIG_FLAGS = DEFAULT_CONFIG["flags"]
+DEFAULT_CONFIG_TABLE = DEFAULT_CONFIG["table"]
+DEFAULT_CONFIG_KEYS = frozenset(DEFAULT_CONFIG)
+
 class Theme:
     def __init__(self, name, background, text, border, alternate, selection, header):
         self.name = name
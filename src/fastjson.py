@@ -0,0 +1,32 @@
+"""
+JSON helpers that use orjson when it is installed and fall back to the
+stdlib json module otherwise.
+"""
+
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    def loads(data):
+        """Parse JSON from str or bytes (e.g. a requests Response.content)."""
+        return orjson.loads(data)
+
+    def dumps(obj, sort_keys=False):
+        """Serialize to a compact JSON str; non-str dict keys are allowed like in json."""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS if sort_keys else orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(obj, option=option).decode()
+else:
+    def loads(data):
+        """Parse JSON from str or bytes (e.g. a requests Response.content)."""
+        return json.loads(data)
+
+    def dumps(obj, sort_keys=False):
+        """Serialize to a compact JSON str; non-str dict keys are allowed like in json."""
+        # ensure_ascii=False: emit UTF-8 text like orjson instead of \u escapes
+        return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False)
@@ -1,11 +1,16 @@
-import json
 import logging
 from websocket_server import WebsocketServer
+from src import fastjson
 from src.constants import version
 
 logging.getLogger('websocket_server.websocket_server').disabled = True
 
 class Server:
+    __slots__ = (
+        "Error", "log", "lastMessages", "server", "current_theme", "loadouts_data",
+        "_version_cached", "_theme_cached", "_loadouts_cached",
+    )
+
     def __init__(self, log, Error):
         self.Error = Error
         self.log = log
@@ -14,12 +19,18 @@ class Server:
         self.current_theme = "dark"
         self.loadouts_data = None
 
+        # Serialized once and replayed to every new client
+        self._version_cached = self._serialize("version", {"core": version})
+        self._theme_cached = self._serialize("theme", {"theme": self.current_theme})
+        self._loadouts_cached = None
+
     def start_server(self):
         try:
             with open("config.json", "r") as conf:
-                config = json.load(conf)
+                config = fastjson.loads(conf.read())
                 port = config.get("port", 1100)
                 self.current_theme = config.get("theme", "dark").lower()
+                self._theme_cached = self._serialize("theme", {"theme": self.current_theme})
                 
             self.server = WebsocketServer(host="0.0.0.0", port=port)
             self.server.set_fn_new_client(self.handle_new_client)
@@ -38,38 +49,41 @@ class Server:
                 self.server = None
 
     def handle_new_client(self, client, server):
-        self.send_payload("version", {
-            "core": version
-        })
-        
-        self.send_payload("theme", {
-            "theme": self.current_theme
-        })
-        
+        server.send_message(client, self._version_cached)
+        server.send_message(client, self._theme_cached)
+
         if self.loadouts_data:
-            self.send_payload("loadouts", self.loadouts_data)
-            
-        for key in self.lastMessages:
-            if key not in ["chat", "version", "theme", "loadouts"]:
-                self.send_message(self.lastMessages[key])
+            server.send_message(client, self._loadouts_cached)
+
+        # Catch only the joining client up, the others already have these
+        for key, msg_str in list(self.lastMessages.items()):
+            if key not in ("chat", "version", "theme", "loadouts"):
+                server.send_message(client, msg_str)
 
     def send_message(self, message):
         if self.server:
             self.server.send_message_to_all(message)
 
-    def send_payload(self, type, payload):
+    @staticmethod
+    def _serialize(type, payload):
         payload["type"] = type
-        msg_str = json.dumps(payload)
+        return fastjson.dumps(payload)
+
+    def send_payload(self, type, payload):
+        # Every payload goes out as one complete JSON text frame: the website
+        # parses each message on its own and has no notion of partial records.
+        msg_str = self._serialize(type, payload)
         self.lastMessages[type] = msg_str
         if self.server:
             self.server.send_message_to_all(msg_str)
+        return msg_str
     
     def update_theme(self, theme_name):
         self.current_theme = theme_name.lower()
-        self.send_payload("theme", {
+        self._theme_cached = self.send_payload("theme", {
             "theme": self.current_theme
         })
     
     def update_loadouts(self, loadouts_data):
         self.loadouts_data = loadouts_data
-        self.send_payload("loadouts", loadouts_data)
\ No newline at end of file
+        self._loadouts_cached = self.send_payload("loadouts", loadouts_data)
\ No newline at end of file
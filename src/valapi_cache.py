@@ -0,0 +1,152 @@
+"""
+Process-wide cache of the static valorant-api.com catalogs
+(weapons, sprays, agents, titles, cards, buddies...).
+
+The catalogs only change between game patches, so each endpoint is
+downloaded and parsed once per process and shared by every caller.
+Raw responses are also kept on disk with their ETag, so later launches
+only revalidate them (304) instead of downloading them again.
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src import fastjson
+
+VALAPI_URL = "https://valorant-api.com/v1/"
+
+if os.getenv("APPDATA"):
+    CACHE_DIR = os.path.join(os.getenv("APPDATA"), "vry", "valapi")
+else:
+    CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "vry-ui", "valapi")
+
+# One keep-alive session so catalog downloads reuse TCP/TLS connections
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+))
+
+_catalogs = {}
+_indexes = {}
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(name):
+    with _locks_guard:
+        lock = _locks.get(name)
+        if lock is None:
+            lock = _locks[name] = threading.Lock()
+        return lock
+
+
+def _cache_path(name, ext):
+    return os.path.join(CACHE_DIR, re.sub(r"[^\w.-]", "_", name) + ext)
+
+
+def _load_disk_cache(name):
+    """Return (raw body bytes, etag) from disk, or (None, None)."""
+    try:
+        with open(_cache_path(name, ".json"), "rb") as f:
+            body = f.read()
+        etag = None
+        if os.path.exists(_cache_path(name, ".etag")):
+            with open(_cache_path(name, ".etag"), "r") as f:
+                etag = f.read().strip() or None
+        return body, etag
+    except OSError:
+        return None, None
+
+
+def _save_disk_cache(name, body, etag):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = _cache_path(name, ".json.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, _cache_path(name, ".json"))
+        with open(_cache_path(name, ".etag"), "w") as f:
+            f.write(etag or "")
+    except OSError:
+        pass
+
+
+def _download(name):
+    """Fetch an endpoint's raw body, revalidating the disk copy by ETag."""
+    cached_body, etag = _load_disk_cache(name)
+    headers = {"If-None-Match": etag} if cached_body is not None and etag else {}
+    try:
+        response = _session.get(VALAPI_URL + name, headers=headers, timeout=10)
+        if response.status_code == 304 and cached_body is not None:
+            return cached_body
+        response.raise_for_status()
+    except requests.RequestException:
+        # Offline or API down: the last downloaded copy is better than nothing
+        if cached_body is None:
+            raise
+        return cached_body
+    _save_disk_cache(name, response.content, response.headers.get("ETag"))
+    return response.content
+
+
+def get_catalog(name):
+    """
+    Return the parsed "data" list of a valorant-api.com endpoint.
+    :param name: endpoint path relative to /v1/, e.g. "weapons" or "playertitles".
+    :return: the cached list; raises on network/HTTP errors so callers can retry later.
+    """
+    data = _catalogs.get(name)
+    if data is not None:
+        return data
+
+    # One lock per endpoint: different catalogs can be fetched concurrently,
+    # while concurrent callers of the same one wait for a single download.
+    with _lock_for(name):
+        data = _catalogs.get(name)
+        if data is None:
+            data = fastjson.loads(_download(name))["data"]
+            _catalogs[name] = data
+        return data
+
+
+def preload(names, log=None):
+    """
+    Download several catalogs concurrently instead of one after another.
+    :param names: endpoint names, as for get_catalog.
+    :param log: optional callable reporting endpoints that failed.
+    :return: {name: data list, or None if the download failed}
+    """
+    def fetch(name):
+        try:
+            return get_catalog(name)
+        except Exception as e:
+            if log:
+                log(f"API fetch error ({name}): {e}")
+            return None
+
+    # Catalogs already in memory need no thread; only the misses are fetched
+    results = {name: _catalogs.get(name) for name in names}
+    missing = [name for name, data in results.items() if data is None]
+    if missing:
+        with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+            results.update(zip(missing, executor.map(fetch, missing)))
+    return results
+
+
+def get_index(name):
+    """
+    Return a {uuid: item} dict over a catalog, built once per download.
+    :param name: endpoint path relative to /v1/, as for get_catalog.
+    """
+    index = _indexes.get(name)
+    if index is None:
+        index = {item["uuid"]: item for item in get_catalog(name)}
+        _indexes[name] = index
+    return index
+
@@ -2,33 +2,364 @@
 webview component
 """
 
-import json
+import os
+import sys
 import time
-from PySide6.QtCore import QTimer, QUrl, Signal, QThread, QObject, Qt
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QCheckBox, QHBoxLayout
+from collections import deque
+from itertools import count
+from PySide6.QtCore import QTimer, QUrl, Signal, Slot, QThread, QObject, Qt, QCoreApplication, QFile, QIODevice, QLoggingCategory
+from PySide6.QtWidgets import QWidget, QGridLayout, QPushButton, QLabel, QCheckBox, QHBoxLayout
 from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtWebEngineCore import QWebEngineSettings, QWebEnginePage, QWebEngineProfile
+from PySide6.QtWebEngineCore import QWebEngineSettings, QWebEnginePage, QWebEngineProfile, QWebEngineScript
 from PySide6.QtWebChannel import QWebChannel
 from PySide6.QtGui import QFont
+from src import fastjson
 
-class OptimizedWebEnginePage(QWebEnginePage):
+# QtWebEngine's context info (GL/driver details logged when the first view
+# starts); page console output is filtered in javaScriptConsoleMessage instead
+_LOGGING_RULES = "qt.webenginecontext.info=false"
+_logging_rules_installed = False
+
+
+def _install_logging_rules():
+    """
+    Add the web view logging rules once. setFilterRules replaces whatever was
+    set before, so rules from QT_LOGGING_RULES are kept after ours and still win.
+    """
+    global _logging_rules_installed
+    if _logging_rules_installed:
+        return
+    _logging_rules_installed = True
+    env_rules = os.getenv("QT_LOGGING_RULES", "").replace(";", "\n")
+    QLoggingCategory.setFilterRules("\n".join(filter(None, (_LOGGING_RULES, env_rules))))
+
+# Web attributes resolved once; names missing from older Qt builds are skipped
+_WEB_ATTRS = {
+    name: getattr(QWebEngineSettings.WebAttribute, name)
+    for name in (
+        'LocalStorageEnabled', 'LocalContentCanAccessFileUrls', 'XSSAuditingEnabled',
+        'PdfViewerEnabled', 'JavascriptCanOpenWindows', 'WebGLEnabled', 'Accelerated2dCanvasEnabled',
+    )
+    if hasattr(QWebEngineSettings.WebAttribute, name)
+}
+
+# Only the attributes that differ from the QtWebEngine 6 defaults. Already at
+# their default: JavascriptEnabled, ShowScrollBars, WebGLEnabled and
+# Accelerated2dCanvasEnabled (on), PluginsEnabled, JavascriptCanAccessClipboard,
+# SpatialNavigationEnabled, FocusOnNavigationEnabled and
+# AllowGeolocationOnInsecureOrigins (off)
+_DEFAULT_SETTINGS = tuple(
+    (_WEB_ATTRS[name], value)
+    for name, value in (
+        ('LocalStorageEnabled', False),
+        ('LocalContentCanAccessFileUrls', False),
+        ('XSSAuditingEnabled', True),
+        ('PdfViewerEnabled', False),
+        ('JavascriptCanOpenWindows', False),
+    )
+    if name in _WEB_ATTRS
+)
+
+_HARDWARE_ACCELERATION_ATTRS = tuple(
+    _WEB_ATTRS[name] for name in ('WebGLEnabled', 'Accelerated2dCanvasEnabled') if name in _WEB_ATTRS
+)
+
+# Static page tweaks, built once at import instead of on every injection
+_PERF_CSS = """
+* {
+    animation-duration: 0.1s !important;
+    transition-duration: 0.1s !important;
+}
+
+.heavy-shadow, .complex-gradient {
+    box-shadow: none !important;
+    background: linear-gradient(180deg, rgba(0,0,0,0.1) 0%, rgba(0,0,0,0.2) 100%) !important;
+}
+
+.backdrop-blur {
+    backdrop-filter: none !important;
+}
+
+.particles, .particle-container {
+    display: none !important;
+}
+
+.gpu-accelerated {
+    transform: translateZ(0);
+    will-change: transform;
+}
+
+@media (prefers-reduced-motion: reduce) {
+    * {
+        animation: none !important;
+        transition: none !important;
+    }
+}
+"""
+
+# The CSS goes in as a JSON string literal, which escapes quotes, backticks
+# and ${...} that a template literal would choke on
+_PERF_CSS_INJECTION_JS = (
+    "(function() {"
+    "var style = document.createElement('style');"
+    "style.textContent = " + fastjson.dumps(_PERF_CSS) + ";"
+    "(document.head || document.documentElement).appendChild(style);"
+    "document.documentElement.style.setProperty('--reduce-motion', '1');"
+    "})();"
+)
+
+_PERF_JS_INJECTION = """
+(function() {
+    // Runs once per document, however often Performance Mode is toggled
+    if (window.__vryPerfJs) return;
+    window.__vryPerfJs = true;
     
+    let scrolling = false;
+    window.addEventListener('scroll', function() {
+        if (!scrolling) {
+            window.requestAnimationFrame(function() {
+                scrolling = false;
+            });
+            scrolling = true;
+        }
+    }, { passive: true });
+    
+    // Coalesce every rAF registered during a frame into one native rAF;
+    // timing stays on vsync, and hidden pages already get no native frames.
+    // Coalesced ids are negative so they never collide with native ones.
+    if (!window.__vryRafScheduler) {
+        window.__vryRafScheduler = true;
+        const nativeRAF = window.requestAnimationFrame.bind(window);
+        const nativeCAF = window.cancelAnimationFrame.bind(window);
+        let queue = new Map();
+        let nextId = -1;
+        let frame = 0;
+        window.requestAnimationFrame = function(callback) {
+            const id = nextId--;
+            queue.set(id, callback);
+            if (!frame) {
+                frame = nativeRAF(function(time) {
+                    frame = 0;
+                    const callbacks = queue;
+                    queue = new Map();
+                    callbacks.forEach(function(cb) {
+                        try { cb(time); } catch (e) { console.error(e); }
+                    });
+                });
+            }
+            return id;
+        };
+        // Ids the page got from the native rAF before the shim was installed
+        // still have to reach the native cancel
+        window.cancelAnimationFrame = function(id) {
+            if (id >= 0) {
+                nativeCAF(id);
+            } else if (queue.delete(id) && queue.size === 0 && frame) {
+                nativeCAF(frame);
+                frame = 0;
+            }
+        };
+    }
+    
+    let resizeTimeout;
+    window.addEventListener('resize', function(event) {
+        clearTimeout(resizeTimeout);
+        resizeTimeout = setTimeout(function() {
+        }, 250);
+    });
+    
+    // Chromium lazy-loads natively, no observer needed
+    document.querySelectorAll('img[data-src]').forEach(function(img) {
+        img.loading = 'lazy';
+        img.src = img.dataset.src;
+        img.removeAttribute('data-src');
+    });
+})();
+"""
+
+# Installed at DocumentCreation so it is in place before the page creates its
+# first WebGL context. Contexts get the discrete GPU by default and the
+# low-power one when Performance Mode is on (window.__vryPerfMode, which
+# set_perf_mode() prepends); the context loss handlers let the browser
+# restore the context, which it requires to honor 'high-performance'.
+# The cheaper context options are only forced in Performance Mode.
+_CONTEXT_SHIM_NAME = "vry-context-shim"
+_CONTEXT_SHIM_JS = """
+(function() {
+    if (window.__vryContextShim) return;
+    window.__vryContextShim = true;
+    const getContext = HTMLCanvasElement.prototype.getContext;
+    HTMLCanvasElement.prototype.getContext = function(type, ...args) {
+        if (type === 'webgl' || type === 'webgl2' || type === 'experimental-webgl') {
+            args[0] = args[0] || {};
+            args[0].powerPreference = window.__vryPerfMode ? 'low-power' : 'high-performance';
+            if (window.__vryPerfMode) {
+                args[0].antialias = false;
+                args[0].depth = false;
+                args[0].stencil = false;
+                args[0].preserveDrawingBuffer = false;
+                args[0].failIfMajorPerformanceCaveat = false;
+            }
+            if (!this.__vryContextHandlers) {
+                this.__vryContextHandlers = true;
+                this.addEventListener('webglcontextlost', function(event) {
+                    event.preventDefault();
+                }, false);
+                this.addEventListener('webglcontextrestored', function() {
+                    console.info('WebGL context restored');
+                }, false);
+            }
+        } else if (type === '2d' && window.__vryPerfMode) {
+            // Options the page passes explicitly still win
+            args[0] = { desynchronized: true, willReadFrequently: false, ...args[0] };
+        }
+        return getContext.call(this, type, ...args);
+    };
+})();
+"""
+
+_PERF_CSS_SCRIPT_NAME = "vry-perf-css"
+_PERF_JS_SCRIPT_NAME = "vry-perf-js"
+
+
+def _make_script(name, source, injection_point, sub_frames=True):
+    script = QWebEngineScript()
+    script.setName(name)
+    script.setInjectionPoint(injection_point)
+    script.setWorldId(QWebEngineScript.ScriptWorldId.MainWorld)
+    script.setRunsOnSubFrames(sub_frames)
+    script.setSourceCode(source)
+    return script
+
+# Hands a whole batch of updates to the page; pages without the batch
+# entry point still get every update through updateMatchLoadout, applied
+# together in one animation frame so the DOM is laid out once.
+_DISPATCH_UPDATES_JS = (
+    "function(updates){"
+    "if(window.updateMatchLoadoutBatch){window.updateMatchLoadoutBatch(updates);}"
+    "else if(window.updateMatchLoadout){requestAnimationFrame(function(){"
+    "for(const u of updates){window.updateMatchLoadout(u);}});}"
+    "}"
+)
+
+# runJavaScript fallback: the serialized update list goes between the prefix and the suffix
+_APPLY_UPDATES_JS_PREFIX = "(" + _DISPATCH_UPDATES_JS + ")("
+_APPLY_UPDATES_JS_SUFFIX = ");"
+
+# Connects the page to the UpdateBridge; appended to Qt's qwebchannel.js
+_BRIDGE_SCRIPT_NAME = "vry-update-bridge"
+_BRIDGE_JS = """
+(function() {
+    if (typeof QWebChannel === 'undefined' || !window.qt || !qt.webChannelTransport) return;
+    const dispatch = """ + _DISPATCH_UPDATES_JS + """;
+    new QWebChannel(qt.webChannelTransport, function(channel) {
+        const bridge = channel.objects.vryBridge;
+        bridge.updates.connect(function(payload) {
+            dispatch(JSON.parse(payload));
+        });
+        bridge.ready();
+    });
+})();
+"""
+
+_qwebchannel_js = None
+
+
+def _qwebchannel_source():
+    """Qt's qwebchannel.js client, read once from the Qt resources ('' if unavailable)."""
+    global _qwebchannel_js
+    if _qwebchannel_js is None:
+        _qwebchannel_js = ""
+        qwebchannel_file = QFile(":/qtwebchannel/qwebchannel.js")
+        if qwebchannel_file.open(QIODevice.OpenModeFlag.ReadOnly):
+            _qwebchannel_js = bytes(qwebchannel_file.readAll()).decode("utf-8")
+            qwebchannel_file.close()
+    return _qwebchannel_js
+
+class UpdateBridge(QObject):
+    """
+    Pushes serialized update batches to the page as a QWebChannel signal,
+    so delivering them doesn't compile a new script every time.
+    """
+    updates = Signal(str)
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.last_error_time = 0
-        self.error_count = 0
+        self.connected = False
+
+    @Slot()
+    def ready(self):
+        self.connected = True
+
+if os.getenv("APPDATA"):
+    WEBVIEW_DIR = os.path.join(os.getenv("APPDATA"), "vry", "webview")
+else:
+    WEBVIEW_DIR = os.path.join(os.path.expanduser("~"), ".cache", "vry-ui", "webview")
+
+_profile = None
+
+
+def _shared_profile():
+    """
+    Profile shared by every loadouts web view, created and configured once so
+    its network state (connections, DNS, caches) survives reloads and new views.
+    """
+    global _profile
+    if _profile is None:
+        _profile = QWebEngineProfile("vry-loadouts", QCoreApplication.instance())
+        # Disk cache and cookies outlive the process, so reloads and later
+        # launches reuse the site bundle instead of downloading it again
+        _profile.setCachePath(os.path.join(WEBVIEW_DIR, "cache"))
+        _profile.setPersistentStoragePath(os.path.join(WEBVIEW_DIR, "storage"))
+        _profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+        _profile.setHttpCacheMaximumSize(50 * 1024 * 1024)
+        _profile.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.AllowPersistentCookies)
+        _profile.setSpellCheckEnabled(False)
+    return _profile
+
+class OptimizedWebEnginePage(QWebEnginePage):
+    # Emitted for every console error that gets past the rate limit
+    errored = Signal(str)
+
+    # Console errors let through per one second window
+    ERROR_BUDGET = 10
+
+    def __init__(self, profile, parent=None):
+        super().__init__(profile, parent)
+        self._budget = self.ERROR_BUDGET
+        self._budget_reset = 0.0
+        # Recent console errors, for consumers that pull them later
+        self.errors = deque(maxlen=200)
+        # Console errors are written out at most once a second
+        self._unflushed = 0
+        self._err_flush_timer = QTimer(self)
+        self._err_flush_timer.setInterval(1000)
+        self._err_flush_timer.timeout.connect(self.flush_errors)
         
     def javaScriptConsoleMessage(self, level, message, lineNumber, sourceId):
+        # Other levels are dropped here; the base class would log them to "js"
         if level == QWebEnginePage.JavaScriptConsoleMessageLevel.ErrorMessageLevel:
-            current_time = time.time()
-            if current_time - self.last_error_time < 1:
-                self.error_count += 1
-                if self.error_count > 10:
-                    return
-            else:
-                self.error_count = 0
-            self.last_error_time = current_time
-            print(f"[WebView Error] {message}")
+            # Token bucket refilled every second; monotonic so clock jumps can't stall it
+            current_time = time.monotonic()
+            if current_time - self._budget_reset >= 1:
+                self._budget_reset = current_time
+                self._budget = self.ERROR_BUDGET
+            self._budget -= 1
+            if self._budget < 0:
+                return
+            self.errors.append(message)
+            self.errored.emit(message)
+            self._unflushed += 1
+            if not self._err_flush_timer.isActive():
+                self._err_flush_timer.start()
+
+    def flush_errors(self):
+        # sys.stderr is None in windowed (no console) builds
+        if self._unflushed and sys.stderr is not None:
+            new_errors = list(self.errors)[-self._unflushed:]
+            sys.stderr.write("".join(f"[WebView Error] {message}\n" for message in new_errors))
+        self._unflushed = 0
+        self._err_flush_timer.stop()
 
 class PerformanceWebView(QWebEngineView):
     
@@ -37,199 +368,190 @@ class PerformanceWebView(QWebEngineView):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setup_performance_settings()
+        _install_logging_rules()
+        # The page first: settings() belongs to the current page
         self.setup_custom_page()
+        self.setup_performance_settings()
         self.is_active = False
-        self.pending_updates = []
-        self.update_timer = QTimer()
+        # Lifecycle state last given to the page; None until set_active first runs
+        self._last_lifecycle = None
+        # Insertion ordered; an update with an "id" replaces a pending one with the same id
+        self.pending_updates = {}
+        self._update_keys = count()
+        self._last_update_digest = None
+        # Newest update received while inactive, delivered once on activation
+        self._stale_update = None
+        # Only runs while there are updates to deliver to an active page
+        self.update_timer = QTimer(self)
+        self.update_timer.setInterval(100)
         self.update_timer.timeout.connect(self.process_pending_updates)
-        self.update_timer.start(100)
+        # Forwarded to load_finished for the container
+        self.loadFinished.connect(self._on_load_finished)
+        # A new document (or a restarted renderer) has none of the updates sent so far
+        self.loadStarted.connect(self._reset_update_state)
+        self.page().renderProcessTerminated.connect(self._reset_update_state)
         
     def setup_custom_page(self):
-        custom_page = OptimizedWebEnginePage(self)
+        custom_page = OptimizedWebEnginePage(_shared_profile(), self)
         self.setPage(custom_page)
+        self.set_perf_mode(False)
+        # Set up by the first queued update; until then the page gets no web channel
+        self._bridge = None
+
+    def setup_update_bridge(self):
+        if self._bridge is not None:
+            return
+        self._bridge = UpdateBridge(self)
+        qwebchannel_js = _qwebchannel_source()
+        if not qwebchannel_js:
+            return
+        self._channel = QWebChannel(self.page())
+        self._channel.registerObject("vryBridge", self._bridge)
+        self.page().setWebChannel(self._channel)
+        self._replace_scripts((_BRIDGE_SCRIPT_NAME,), (_make_script(
+            _BRIDGE_SCRIPT_NAME, qwebchannel_js + _BRIDGE_JS,
+            QWebEngineScript.InjectionPoint.DocumentCreation, sub_frames=False,
+        ),))
+        # A new document has to connect again before the bridge can be used
+        self.loadStarted.connect(self._on_bridge_load_started)
+
+    def _on_bridge_load_started(self):
+        self._bridge.connected = False
+
+    def set_perf_mode(self, enabled):
+        """
+        Tell the page whether Performance Mode is on, which picks the WebGL powerPreference.
+        Applies to contexts created from now on, including after reloads.
+        """
+        assignment = f"window.__vryPerfMode = {'true' if enabled else 'false'};"
+        self._replace_scripts((_CONTEXT_SHIM_NAME,), (_make_script(
+            _CONTEXT_SHIM_NAME, assignment + _CONTEXT_SHIM_JS,
+            QWebEngineScript.InjectionPoint.DocumentCreation,
+        ),))
+        self.page().runJavaScript(assignment)
+
+    def set_performance_scripts(self, enabled):
+        """
+        Register (or drop) the performance CSS/JS as page scripts, so every document
+        loaded from now on gets them as soon as its DOM is ready, without timers.
+        """
+        scripts = ()
+        if enabled:
+            scripts = (
+                _make_script(_PERF_CSS_SCRIPT_NAME, _PERF_CSS_INJECTION_JS,
+                             QWebEngineScript.InjectionPoint.DocumentReady),
+                _make_script(_PERF_JS_SCRIPT_NAME, _PERF_JS_INJECTION,
+                             QWebEngineScript.InjectionPoint.DocumentReady),
+            )
+        self._replace_scripts((_PERF_CSS_SCRIPT_NAME, _PERF_JS_SCRIPT_NAME), scripts)
+
+    def _replace_scripts(self, names, new_scripts):
+        scripts = self.page().scripts()
+        for name in names:
+            for script in scripts.find(name):
+                scripts.remove(script)
+        for script in new_scripts:
+            scripts.insert(script)
         
     def setup_performance_settings(self):
         settings = self.settings()
-        profile = self.page().profile()
-        
-        def safe_set_attribute(attr_name, value):
-            if hasattr(QWebEngineSettings.WebAttribute, attr_name):
-                attr = getattr(QWebEngineSettings.WebAttribute, attr_name)
-                settings.setAttribute(attr, value)
-        
-        safe_set_attribute('JavascriptEnabled', True)
-        safe_set_attribute('LocalStorageEnabled', False)
-        safe_set_attribute('PluginsEnabled', False)
-        safe_set_attribute('JavascriptCanOpenWindows', False)
-        safe_set_attribute('JavascriptCanAccessClipboard', False)
-        safe_set_attribute('LocalContentCanAccessFileUrls', False)
-        safe_set_attribute('XSSAuditingEnabled', True)
-        safe_set_attribute('SpatialNavigationEnabled', False)
-        safe_set_attribute('FocusOnNavigationEnabled', False)
-        safe_set_attribute('AllowGeolocationOnInsecureOrigins', False)
-        safe_set_attribute('WebGLEnabled', True)
-        safe_set_attribute('Accelerated2dCanvasEnabled', True)
-        safe_set_attribute('PdfViewerEnabled', False)
-        safe_set_attribute('ShowScrollBars', True)
-        
-        profile.setHttpCacheMaximumSize(50 * 1024 * 1024)
+        for attr, value in _DEFAULT_SETTINGS:
+            settings.setAttribute(attr, value)
         
     def set_hardware_acceleration(self, enabled):
         settings = self.settings()
-        
-        def safe_set_attribute(attr_name, value):
-            if hasattr(QWebEngineSettings.WebAttribute, attr_name):
-                attr = getattr(QWebEngineSettings.WebAttribute, attr_name)
-                settings.setAttribute(attr, value)
-        
-        safe_set_attribute('WebGLEnabled', enabled)
-        safe_set_attribute('Accelerated2dCanvasEnabled', enabled)
+        for attr in _HARDWARE_ACCELERATION_ATTRS:
+            settings.setAttribute(attr, enabled)
         
     def inject_performance_css(self):
-        css = """
-        * {
-            animation-duration: 0.1s !important;
-            transition-duration: 0.1s !important;
-        }
-        
-        .heavy-shadow, .complex-gradient {
-            box-shadow: none !important;
-            background: linear-gradient(180deg, rgba(0,0,0,0.1) 0%, rgba(0,0,0,0.2) 100%) !important;
-        }
-        
-        .backdrop-blur {
-            backdrop-filter: none !important;
-        }
-        
-        .particles, .particle-container {
-            display: none !important;
-        }
-        
-        .gpu-accelerated {
-            transform: translateZ(0);
-            will-change: transform;
-        }
-        """
-        
-        js_code = f"""
-        (function() {{
-            var style = document.createElement('style');
-            style.textContent = `{css}`;
-            document.head.appendChild(style);
-        }})();
-        """
-        self.page().runJavaScript(js_code)
+        self.page().runJavaScript(_PERF_CSS_INJECTION_JS)
         
     def inject_performance_javascript(self):
-        js_code = """
-        (function() {
-            let scrolling = false;
-            window.addEventListener('scroll', function() {
-                if (!scrolling) {
-                    window.requestAnimationFrame(function() {
-                        scrolling = false;
-                    });
-                    scrolling = true;
-                }
-            }, { passive: true });
-            
-            const originalRAF = window.requestAnimationFrame;
-            let skipFrame = false;
-            window.requestAnimationFrame = function(callback) {
-                if (skipFrame) {
-                    skipFrame = false;
-                    return originalRAF(callback);
-                }
-                skipFrame = true;
-                return setTimeout(callback, 32);
-            };
-            
-            let resizeTimeout;
-            window.addEventListener('resize', function(event) {
-                clearTimeout(resizeTimeout);
-                resizeTimeout = setTimeout(function() {
-                }, 250);
-            });
-            
-            if (window.WebGLRenderingContext) {
-                const getContext = HTMLCanvasElement.prototype.getContext;
-                HTMLCanvasElement.prototype.getContext = function(type, ...args) {
-                    if (type === 'webgl' || type === 'webgl2' || type === 'experimental-webgl') {
-                        args[0] = args[0] || {};
-                        args[0].antialias = false;
-                        args[0].depth = false;
-                        args[0].powerPreference = 'low-power';
-                        args[0].preserveDrawingBuffer = false;
-                        args[0].failIfMajorPerformanceCaveat = false;
-                    }
-                    return getContext.call(this, type, ...args);
-                };
-            }
-            
-            if ('IntersectionObserver' in window) {
-                const imageObserver = new IntersectionObserver((entries, observer) => {
-                    entries.forEach(entry => {
-                        if (entry.isIntersecting) {
-                            const img = entry.target;
-                            if (img.dataset.src) {
-                                img.src = img.dataset.src;
-                                img.removeAttribute('data-src');
-                                observer.unobserve(img);
-                            }
-                        }
-                    });
-                });
-                
-                document.querySelectorAll('img[data-src]').forEach(img => {
-                    imageObserver.observe(img);
-                });
-            }
-        })();
-        """
-        self.page().runJavaScript(js_code)
+        self.page().runJavaScript(_PERF_JS_INJECTION)
+
+    def inject_performance_tweaks(self):
+        self.inject_performance_css()
+        self.inject_performance_javascript()
     
-    def loadFinished(self, ok):
-        super().loadFinished(ok)
-        if ok:
-            QTimer.singleShot(1000, self.inject_performance_css)
-            QTimer.singleShot(1500, self.inject_performance_javascript)
+    def _on_load_finished(self, ok):
         self.load_finished.emit(ok)
+
+    def _reset_update_state(self, *args):
+        self._last_update_digest = None
+        self.pending_updates.clear()
+        self.update_timer.stop()
     
     def queue_update(self, update_data):
-        self.pending_updates.append(update_data)
+        # The current document keeps the runJavaScript path; documents loaded
+        # from now on connect to the bridge
+        self.setup_update_bridge()
+        # Upstream often re-sends the same snapshot; don't push it into the page twice
+        digest = hash(fastjson.dumps(update_data, sort_keys=True))
+        if digest == self._last_update_digest:
+            return
+        self._last_update_digest = digest
+        if not self.is_active:
+            # A frozen page can't run it anyway; only the newest state matters
+            self._stale_update = update_data
+            return
+        self._enqueue(update_data)
+
+    def _enqueue(self, update_data):
+        key = update_data.get("id") if isinstance(update_data, dict) else None
+        if key is None:
+            key = ("anon", next(self._update_keys))
+        else:
+            # Move a superseded entry to the end, in arrival order
+            self.pending_updates.pop(key, None)
+        self.pending_updates[key] = update_data
+        if not self.update_timer.isActive():
+            self.update_timer.start()
         
     def process_pending_updates(self):
         if not self.pending_updates or not self.is_active:
+            self.update_timer.stop()
             return
             
-        updates_to_process = self.pending_updates[:5]
-        self.pending_updates = self.pending_updates[5:]
-        
-        for update in updates_to_process:
-            self.apply_update(update)
+        # The page handles the whole array itself, so drain everything at once
+        updates_to_process = list(self.pending_updates.values())
+        self.pending_updates.clear()
+        self.update_timer.stop()
+        self.apply_updates(updates_to_process)
             
     def apply_update(self, update_data):
+        self.apply_updates([update_data])
+
+    def apply_updates(self, updates):
         try:
-            js_code = f"""
-            if (window.updateMatchLoadout) {{
-                window.updateMatchLoadout({json.dumps(update_data)});
-            }}
-            """
-            self.page().runJavaScript(js_code)
+            payload = fastjson.dumps(updates)
+            if self._bridge is not None and self._bridge.connected:
+                self._bridge.updates.emit(payload)
+            else:
+                self.page().runJavaScript(_APPLY_UPDATES_JS_PREFIX + payload + _APPLY_UPDATES_JS_SUFFIX)
         except Exception as e:
             print(f"Error applying update: {e}")
     
     def set_active(self, active):
+        if active == self.is_active:
+            return
         self.is_active = active
-        if hasattr(self.page(), 'setLifecycleState'):
-            try:
-                if not active:
-                    self.page().setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
-                else:
-                    self.page().setLifecycleState(QWebEnginePage.LifecycleState.Active)
-            except AttributeError:
-                pass
+        if not active:
+            self.update_timer.stop()
+        else:
+            if self._stale_update is not None:
+                self._enqueue(self._stale_update)
+                self._stale_update = None
+            if self.pending_updates:
+                self.update_timer.start()
+        # Freezing and unfreezing goes through Chromium, so only on a real change
+        try:
+            target = QWebEnginePage.LifecycleState.Active if active else QWebEnginePage.LifecycleState.Frozen
+            if target != self._last_lifecycle:
+                self.page().setLifecycleState(target)
+                self._last_lifecycle = target
+        except AttributeError:
+            # Qt builds without page lifecycle support
+            pass
 
 class MatchLoadoutsContainer(QWidget):
     
@@ -240,10 +562,13 @@ class MatchLoadoutsContainer(QWidget):
         self.init_ui()
         
     def init_ui(self):
-        self.layout = QVBoxLayout()
+        # One grid on the container: the controls in row 0, the web view in row 1.
+        # The grid itself has no margins so the view fills the tab edge to edge
+        self.layout = QGridLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
+        self.layout.setVerticalSpacing(0)
         
-        control_panel = QWidget()
+        # Only the control row is padded; a layout, not a wrapper widget
         control_layout = QHBoxLayout()
         control_layout.setContentsMargins(10, 5, 10, 5)
         
@@ -262,17 +587,14 @@ class MatchLoadoutsContainer(QWidget):
         self.status_label = QLabel("Status: Loading...")
         control_layout.addWidget(self.status_label)
         
-        control_panel.setLayout(control_layout)
-        self.layout.addWidget(control_panel)
-        
-        self.content_widget = QWidget()
-        self.content_layout = QVBoxLayout(self.content_widget)
-        self.content_layout.setContentsMargins(0, 0, 0, 0)
-        
-        self.layout.addWidget(self.content_widget, 1)
-        self.setLayout(self.layout)
-        
-        self.show_web_view()
+        self.layout.addLayout(control_layout, 0, 0)
+        self.layout.setRowStretch(1, 1)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # The view (and its render process) is only created once the tab is first shown
+        if not self.web_view:
+            self.show_web_view()
         
     def show_web_view(self):
         if not self.web_view:
@@ -280,7 +602,10 @@ class MatchLoadoutsContainer(QWidget):
                 self.web_view = PerformanceWebView()
                 self.web_view.load(QUrl("https://vry-ui.vercel.app/matchLoadouts"))
                 self.web_view.load_finished.connect(self.on_load_finished)
-                self.content_layout.addWidget(self.web_view)
+                self.layout.addWidget(self.web_view, 1, 0)
+                if self.performance_mode:
+                    # Toggled before the view existed
+                    self.toggle_performance_mode(True)
             except Exception as e:
                 print(f"Error creating web view: {e}")
                 self.status_label.setText("Status: Failed to load web view")
@@ -293,9 +618,11 @@ class MatchLoadoutsContainer(QWidget):
         self.performance_mode = checked
         if self.web_view:
             self.web_view.set_hardware_acceleration(not checked)
+            self.web_view.set_perf_mode(checked)
+            self.web_view.set_performance_scripts(checked)
             if checked:
-                self.web_view.inject_performance_css()
-                self.web_view.inject_performance_javascript()
+                # Documents loaded from now on get the scripts; patch the current one too
+                self.web_view.inject_performance_tweaks()
             self.status_label.setText(f"Status: Performance Mode {'ON' if checked else 'OFF'}")
             
     def reload_view(self):
@@ -306,9 +633,6 @@ class MatchLoadoutsContainer(QWidget):
     def on_load_finished(self, ok):
         if ok:
             self.status_label.setText("Status: Loaded Successfully")
-            if self.performance_mode and self.web_view:
-                QTimer.singleShot(1000, self.web_view.inject_performance_css)
-                QTimer.singleShot(1500, self.web_view.inject_performance_javascript)
         else:
             self.status_label.setText("Status: Load Failed")
             
@@ -319,6 +643,7 @@ class MatchLoadoutsContainer(QWidget):
     def cleanup(self):
         try:
             if self.web_view:
+                self.web_view.update_timer.stop()
                 self.web_view.stop()
                 self.web_view.deleteLater()
                 self.web_view = None